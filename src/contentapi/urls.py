@@ -1,11 +1,13 @@
 from django.contrib import admin
 from django.urls import path
 
-from contents.views import ContentAPIView, ContentStatsAPIView
+from contents.views import ContentAPIView, ContentLookupAPIView, ContentStatsAPIView, ContentStatsHistoryAPIView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
 
+    path("api/contents/stats/history/", ContentStatsHistoryAPIView.as_view(), name="api-contents-stats-history"),
     path("api/contents/stats/", ContentStatsAPIView.as_view(), name="api-contents-stats"),
+    path("api/contents/lookup/", ContentLookupAPIView.as_view(), name="api-contents-lookup"),
     path("api/contents/", ContentAPIView.as_view(), name="api-contents"),
 ]
@@ -0,0 +1,22 @@
+from django.db.models import Field, ForeignObject, Lookup
+
+
+@ForeignObject.register_lookup
+@Field.register_lookup
+class Any(Lookup):
+    """
+    `field = ANY(%s)`, the values are sent as a single array parameter instead of
+    one parameter per value like `__in` does. Meant for lookups of thousands of values.
+    Usage: Content.objects.filter(unique_id__any=["id-1", "id-2"])
+    """
+    lookup_name = "any"
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        field = self.lhs.output_field
+        return "%s", [[field.get_db_prep_value(item, connection, prepared=False) for item in value]]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} = ANY({rhs})", [*lhs_params, *rhs_params]
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+from contents.models import Author, Content
+
+
+def author_aggregates(queryset):
+    """
+    Aggregates of `Author.AGGREGATE_FIELDS` computed from the contents, grouped by author.
+    """
+    return queryset.values("author_id").annotate(
+        content_count=Count("id"),
+        total_likes=Coalesce(Sum("like_count"), 0),
+        total_comments=Coalesce(Sum("comment_count"), 0),
+        total_views=Coalesce(Sum("view_count"), 0),
+        total_shares=Coalesce(Sum("share_count"), 0),
+    ).order_by()
+
+
+class Command(BaseCommand):
+    help = "Verify the aggregate counters stored on the authors against their contents, and repair them with --repair"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repair", action="store_true", help="Rewrite the counters that don't match")
+
+    def handle(self, *args, **options):
+        expected = {row.pop("author_id"): row for row in author_aggregates(Content.objects.all())}
+        empty = dict.fromkeys(Author.AGGREGATE_FIELDS, 0)
+
+        mismatched = []
+        for author in Author.objects.only(*Author.AGGREGATE_FIELDS).iterator():
+            values = expected.get(author.id, empty)
+            if any(getattr(author, field) != values[field] for field in Author.AGGREGATE_FIELDS):
+                mismatched.append(author.id)
+                stored = [getattr(author, field) for field in Author.AGGREGATE_FIELDS]
+                computed = [values[field] for field in Author.AGGREGATE_FIELDS]
+                self.stdout.write(f"Author {author.id}: stored {stored}, expected {computed}")
+
+        if options["repair"]:
+            for author_id in mismatched:
+                # Recomputed under the author's row lock, so deltas of concurrent ingestion are not lost
+                with transaction.atomic():
+                    Author.objects.select_for_update().filter(id=author_id).first()
+                    values = next(iter(author_aggregates(Content.objects.filter(author_id=author_id))), {})
+                    values.pop("author_id", None)
+                    Author.objects.filter(id=author_id).update(**{**empty, **values})
+
+        action = "repaired" if options["repair"] else "found"
+        self.stdout.write(self.style.SUCCESS(f"{len(mismatched)} author(s) with mismatched counters {action}"))
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:49
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentStatsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('captured_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('like_delta', models.BigIntegerField(default=0)),
+                ('comment_delta', models.BigIntegerField(default=0)),
+                ('view_delta', models.BigIntegerField(default=0)),
+                ('share_delta', models.BigIntegerField(default=0)),
+                ('author', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='contents.author')),
+                ('content', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='contents.content')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.BrinIndex(fields=['captured_at'], name='contentstats_captured_brin'), models.Index(fields=['content', 'captured_at'], name='contentstats_content_time'), models.Index(fields=['author', 'captured_at'], name='contentstats_author_time')],
+            },
+        ),
+    ]
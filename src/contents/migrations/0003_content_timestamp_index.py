@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0002_contentstatssnapshot'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='content',
+            name='timestamp',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
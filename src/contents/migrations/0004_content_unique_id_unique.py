@@ -0,0 +1,37 @@
+# Generated by Django 5.1.1 on 2026-10-19 04:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_unique_ids(apps, schema_editor):
+    """
+    Fail before touching the schema when contents share an external id, the unique index can't be built.
+    """
+    Content = apps.get_model("contents", "Content")
+    duplicates = list(
+        Content.objects.values("unique_id").annotate(
+            count=Count("id"),
+        ).filter(count__gt=1).order_by().values_list("unique_id", flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Contents with duplicated `unique_id` must be merged or removed before adding the unique index, "
+            f"duplicated ids (first 20): {duplicates}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0003_content_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_unique_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='content',
+            name='unique_id',
+            field=models.CharField(db_index=True, max_length=1024, unique=True),
+        ),
+    ]
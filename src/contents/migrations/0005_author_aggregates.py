@@ -0,0 +1,66 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_author_aggregates(apps, schema_editor):
+    Author = apps.get_model("contents", "Author")
+    Content = apps.get_model("contents", "Content")
+
+    def aggregate(expression):
+        return Coalesce(Subquery(
+            Content.objects.filter(author_id=OuterRef("pk")).order_by().values("author_id").annotate(
+                value=expression,
+            ).values("value")
+        ), 0)
+
+    Author.objects.update(
+        content_count=aggregate(Count("id")),
+        total_likes=aggregate(Sum("like_count")),
+        total_comments=aggregate(Sum("comment_count")),
+        total_views=aggregate(Sum("view_count")),
+        total_shares=aggregate(Sum("share_count")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0004_content_unique_id_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='content_count',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='total_comments',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='total_likes',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='total_shares',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='total_views',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='author',
+            name='username',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.RunPython(backfill_author_aggregates, migrations.RunPython.noop),
+    ]
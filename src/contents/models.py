@@ -1,4 +1,6 @@
-from django.db import models
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import models, transaction
+from django.utils import timezone
 
 
 class Author(models.Model):
@@ -6,7 +8,7 @@ class Author(models.Model):
     TODO: When the data is being created or updated we don't know, need to add that information
     """
     name = models.CharField(max_length=100)
-    username = models.CharField(max_length=100)
+    username = models.CharField(max_length=100, db_index=True)
     unique_id = models.CharField(max_length=1024, db_index=True, unique=True)
     url = models.CharField(max_length=1024, blank=True, )
     title = models.CharField(max_length=1024, blank=True, )
@@ -14,13 +16,23 @@ class Author(models.Model):
     secret_value = models.JSONField(blank=True, null=True)
     followers = models.IntegerField(default=0)
 
+    # Aggregates of the author's contents, maintained at write time by `Content.record_stats`.
+    # `manage.py sync_author_stats` verifies and repairs them.
+    content_count = models.BigIntegerField(default=0)
+    total_likes = models.BigIntegerField(default=0)
+    total_comments = models.BigIntegerField(default=0)
+    total_views = models.BigIntegerField(default=0)
+    total_shares = models.BigIntegerField(default=0)
+
+    AGGREGATE_FIELDS = ["content_count", "total_likes", "total_comments", "total_views", "total_shares"]
+
 
 class Content(models.Model):
     """
     TODO: When the data is being created or updated we don't know, need to add that information
     """
     author = models.ForeignKey(Author, on_delete=models.CASCADE)
-    unique_id = models.CharField(max_length=1024, )
+    unique_id = models.CharField(max_length=1024, db_index=True, unique=True)
     url = models.CharField(max_length=1024, blank=True, )
     title = models.TextField(blank=True)
     like_count = models.BigIntegerField(blank=True, null=False, default=0, )
@@ -28,10 +40,93 @@ class Content(models.Model):
     view_count = models.BigIntegerField(blank=True, null=False, default=0, )
     share_count = models.BigIntegerField(blank=True, null=False, default=0, )
     thumbnail_url = models.URLField(max_length=1024, blank=True, null=True)
-    timestamp = models.DateTimeField(blank=True, null=True, )
+    timestamp = models.DateTimeField(blank=True, null=True, db_index=True)
     big_metadata = models.JSONField(blank=True, null=True)
     secret_value = models.JSONField(blank=True, null=True)
 
+    # Incoming `stats` key -> Content field
+    STAT_FIELDS = {
+        "likes": "like_count",
+        "comments": "comment_count",
+        "views": "view_count",
+        "shares": "share_count",
+    }
+
+    def update_stats(self, stats):
+        """
+        Store the freshly pulled `stats` on the content and append a snapshot of the change.
+        Nothing is written when none of the values changed, returns the snapshot or None.
+        """
+        with transaction.atomic():
+            current = Content.objects.select_for_update().only(
+                *self.STAT_FIELDS.values()
+            ).get(pk=self.pk)
+            previous = {field: getattr(current, field) for field in self.STAT_FIELDS.values()}
+            values = {field: stats[key] for key, field in self.STAT_FIELDS.items()}
+            if values == previous:
+                return None
+            Content.objects.filter(pk=self.pk).update(**values)
+            for field, value in values.items():
+                setattr(self, field, value)
+            return self.record_stats(previous)
+
+    def record_stats(self, previous=None):
+        """
+        Append the change from `previous` (None for a new content) to the stats history and add it
+        to the author's aggregates. The author is updated with `F()` deltas so concurrent ingestion stays exact.
+        """
+        with transaction.atomic():
+            snapshot = ContentStatsSnapshot.record(self, previous)
+            Author.objects.filter(pk=self.author_id).update(
+                content_count=models.F("content_count") + (1 if previous is None else 0),
+                total_likes=models.F("total_likes") + snapshot.like_delta,
+                total_comments=models.F("total_comments") + snapshot.comment_delta,
+                total_views=models.F("total_views") + snapshot.view_delta,
+                total_shares=models.F("total_shares") + snapshot.share_delta,
+            )
+            return snapshot
+
+
+class ContentStatsSnapshot(models.Model):
+    """
+    Append-only history of the stats of a content, one narrow row per observed change.
+    Values are stored as deltas against the previous snapshot (the first one against 0),
+    so summing the deltas of a bucket gives the growth of a content or an author in it.
+    """
+    # Both foreign keys are covered by the composite indexes below
+    content = models.ForeignKey(Content, on_delete=models.CASCADE, db_index=False)
+    # Denormalized from the content so author series don't need a join
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, db_index=False)
+    captured_at = models.DateTimeField(default=timezone.now)
+    like_delta = models.BigIntegerField(default=0)
+    comment_delta = models.BigIntegerField(default=0)
+    view_delta = models.BigIntegerField(default=0)
+    share_delta = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Rows are appended in time order, a BRIN index stays tiny and cheap to maintain
+            BrinIndex(fields=['captured_at'], name='contentstats_captured_brin'),
+            models.Index(fields=['content', 'captured_at'], name='contentstats_content_time'),
+            models.Index(fields=['author', 'captured_at'], name='contentstats_author_time'),
+        ]
+
+    @classmethod
+    def record(cls, content, previous=None):
+        """
+        Append the difference between the current stats of `content` and `previous`
+        (a mapping of Content stat field -> value, all 0 for a new content).
+        """
+        previous = previous or {}
+        return cls.objects.create(
+            content=content,
+            author_id=content.author_id,
+            like_delta=content.like_count - previous.get("like_count", 0),
+            comment_delta=content.comment_count - previous.get("comment_count", 0),
+            view_delta=content.view_count - previous.get("view_count", 0),
+            share_delta=content.share_count - previous.get("share_count", 0),
+        )
+
 
 class Tag(models.Model):
     """
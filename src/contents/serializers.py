@@ -1,13 +1,24 @@
+import zoneinfo
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
 
 from contents.models import Content, Author
 
+# IANA names the client can send as `tz`, `localtime` is only a link to the server's own zone
+TIMEZONES = zoneinfo.available_timezones() - {"localtime"}
+
+# Upper bound of the buckets of a stats series, and how many buckets a day of `timeframe` spans
+MAX_SERIES_BUCKETS = 1000
+BUCKETS_PER_DAY = {"hour": 24, "day": 1, "week": 1 / 7}
+
 
 # For Reading the data from the DB
 class AuthorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Author
-        fields = '__all__'
+        exclude = Author.AGGREGATE_FIELDS
 
 
 class ContentBaseSerializer(serializers.ModelSerializer):
@@ -64,3 +75,74 @@ class ContentPostSerializer(serializers.Serializer):
     title = serializers.CharField(required=True)
     hashtags = serializers.ListField(child=serializers.CharField())
     timestamp = serializers.DateTimeField(required=True)
+
+
+class ContentLookupSerializer(serializers.Serializer):
+    """
+    unq_external_ids : Content -> unique_id, the contents to fetch
+    """
+    unq_external_ids = serializers.ListField(
+        child=serializers.CharField(), allow_empty=False, max_length=5000,
+    )
+
+
+# For validating the query params of the stats api
+class ContentStatsQuerySerializer(serializers.Serializer):
+    """
+    author_id       : Author's db id
+    author_username : Author's username
+    timeframe       : Content that has timestamp: now - 'x' days, defaults to 30 with a `bucket`
+    tag_id          : Tag ID
+    tag             : Tag name
+    title           : Insensitive match on the title
+    tz              : Client's timezone (IE: `Asia/Dhaka`), used for the buckets and the timeframe
+    bucket          : Return a time series of `hour`, `day` or `week` buckets instead of a grand total
+    """
+    author_id = serializers.IntegerField(required=False)
+    author_username = serializers.CharField(required=False)
+    timeframe = serializers.IntegerField(required=False, min_value=1)
+    tag_id = serializers.IntegerField(required=False)
+    tag = serializers.CharField(required=False)
+    title = serializers.CharField(required=False)
+    tz = serializers.CharField(default="UTC")
+    bucket = serializers.ChoiceField(choices=["hour", "day", "week"], required=False)
+
+    def validate_tz(self, value):
+        if value not in TIMEZONES:
+            raise serializers.ValidationError(f"Unknown timezone `{value}`.")
+        return zoneinfo.ZoneInfo(value)
+
+    def validate(self, attrs):
+        if attrs.get("bucket"):
+            attrs.setdefault("timeframe", 30)
+            if attrs["timeframe"] * BUCKETS_PER_DAY[attrs["bucket"]] > MAX_SERIES_BUCKETS:
+                raise serializers.ValidationError(
+                    f"`timeframe` is too long for `{attrs['bucket']}` buckets, "
+                    f"the series is limited to {MAX_SERIES_BUCKETS} buckets."
+                )
+        return attrs
+
+
+# For validating the query params of the stats history api
+class ContentStatsHistorySerializer(serializers.Serializer):
+    """
+    content_id : Content's db id
+    author_id  : Author's db id
+    start      : Beginning of the range, defaults to `end` - 30 days
+    end        : End of the range (exclusive), defaults to now
+    bucket     : Size of the downsampled buckets
+    """
+    content_id = serializers.IntegerField(required=False)
+    author_id = serializers.IntegerField(required=False)
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    bucket = serializers.ChoiceField(choices=["hour", "day", "week"], default="day")
+
+    def validate(self, attrs):
+        if ("content_id" in attrs) == ("author_id" in attrs):
+            raise serializers.ValidationError("Exactly one of `content_id` or `author_id` is required.")
+        attrs.setdefault("end", timezone.now())
+        attrs.setdefault("start", attrs["end"] - timedelta(days=30))
+        if attrs["start"] >= attrs["end"]:
+            raise serializers.ValidationError("`start` must be before `end`.")
+        return attrs
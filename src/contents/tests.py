@@ -1,3 +1,256 @@
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from contents.models import Author, Content, ContentStatsSnapshot
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+def content_payload(unique_id, author_id="author-1", likes=1, views=10, hashtags=()):
+    return {
+        "unq_external_id": unique_id,
+        "stats": {"likes": likes, "comments": 1, "views": views, "shares": 0},
+        "author": {
+            "unique_name": author_id,
+            "full_name": "Author",
+            "unique_external_id": author_id,
+            "url": "https://example.com/author",
+            "title": "Author",
+            "big_metadata": {},
+            "secret_value": {},
+        },
+        "big_metadata": {},
+        "secret_value": {},
+        "thumbnail_view_url": "https://example.com/thumbnail.png",
+        "title": f"Content {unique_id}",
+        "hashtags": list(hashtags),
+        "timestamp": "2026-10-18T10:00:00Z",
+    }
+
+
+class ContentStatsHistoryTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_unchanged_stats_write_no_snapshot(self):
+        self.client.post("/api/contents/", content_payload("content-1", likes=5), format="json")
+        content = Content.objects.get(unique_id="content-1")
+
+        self.assertIsNone(content.update_stats({"likes": 5, "comments": 1, "views": 10, "shares": 0}))
+        self.client.post("/api/contents/", content_payload("content-1", likes=5), format="json")
+
+        self.assertEqual(ContentStatsSnapshot.objects.filter(content=content).count(), 1)
+
+    def test_changed_stats_append_deltas(self):
+        self.client.post("/api/contents/", content_payload("content-1", likes=5, views=10), format="json")
+        self.client.post("/api/contents/", content_payload("content-1", likes=8, views=10), format="json")
+
+        content = Content.objects.get(unique_id="content-1")
+        self.assertEqual(content.like_count, 8)
+        self.assertEqual(
+            list(ContentStatsSnapshot.objects.order_by("id").values_list("like_delta", "view_delta")),
+            [(5, 10), (3, 0)],
+        )
+
+        response = self.client.get(f"/api/contents/stats/history/?content_id={content.id}")
+        self.assertEqual(response.status_code, 200)
+        series = response.json()["series"]
+        self.assertEqual(len(series), 1)
+        self.assertEqual((series[0]["likes"], series[0]["views"]), (8, 10))
+
+
+class ContentLookupTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        payloads = [
+            content_payload("content-1", likes=6, views=10, hashtags=["a", "b"]),
+            content_payload("content-2"),
+        ]
+        for payload in payloads:
+            self.client.post("/api/contents/", payload, format="json")
+
+    def test_returns_contents_in_requested_order_and_not_found_ids(self):
+        response = self.client.post(
+            "/api/contents/lookup/",
+            {"unq_external_ids": ["content-2", "missing", "content-1", "content-2"]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item["content"]["unique_id"] for item in data["results"]], ["content-2", "content-1"])
+        self.assertEqual(data["not_found"], ["missing"])
+        content = data["results"][1]["content"]
+        self.assertEqual(sorted(content["tags"]), ["a", "b"])
+        self.assertEqual(content["total_engagement"], 7)
+        self.assertEqual(content["engagement_rate"], 0.7)
+        self.assertEqual(data["results"][1]["author"]["unique_id"], "author-1")
+        self.assertEqual(data["results"][0]["content"]["tags"], [])
+
+    def test_runs_a_fixed_number_of_queries(self):
+        unique_ids = ["content-1", "content-2", *[f"missing-{index}" for index in range(1000)]]
+        with self.assertNumQueries(2):
+            self.client.post("/api/contents/lookup/", {"unq_external_ids": unique_ids}, format="json")
+
+    def test_rejects_empty_lists(self):
+        response = self.client.post("/api/contents/lookup/", {"unq_external_ids": []}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+
+
+class ContentStatsSeriesTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = Author.objects.create(name="Author", username="author", unique_id="author-1")
+
+    def create_content(self, unique_id, timestamp, likes=1):
+        return Content.objects.create(
+            author=self.author, unique_id=unique_id, timestamp=timestamp, like_count=likes, view_count=10,
+        )
+
+    def get_series(self, query, now):
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            return self.client.get(f"/api/contents/stats/?{query}")
+
+    def test_fills_gaps_from_timeframe_start_in_client_zone(self):
+        # 2026-03-06 23:00 in New York, before the timeframe
+        self.create_content("before", utc(2026, 3, 7, 4))
+        # 2026-03-07 22:30 in New York, the 8th in UTC
+        self.create_content("first-day", utc(2026, 3, 8, 3, 30), likes=3)
+        self.create_content("third-day", utc(2026, 3, 9, 15), likes=5)
+
+        response = self.get_series("tz=America/New_York&bucket=day&timeframe=3", now=utc(2026, 3, 10, 12))
+
+        self.assertEqual(response.status_code, 200)
+        series = response.json()["series"]
+        self.assertEqual(
+            [item["bucket"] for item in series],
+            [
+                "2026-03-07T00:00:00-05:00",
+                "2026-03-08T00:00:00-05:00",
+                "2026-03-09T00:00:00-04:00",
+                "2026-03-10T00:00:00-04:00",
+            ],
+        )
+        self.assertEqual([item["total_likes"] for item in series], [3, 0, 5, 0])
+        self.assertEqual([item["total_contents"] for item in series], [1, 0, 1, 0])
+
+    def test_hour_buckets_skip_wall_clock_hours_missing_on_dst_change(self):
+        response = self.get_series("tz=America/New_York&bucket=hour&timeframe=1", now=utc(2026, 3, 8, 12))
+
+        self.assertEqual(response.status_code, 200)
+        buckets = [item["bucket"] for item in response.json()["series"]]
+        # 2026-03-07 08:00 EST to 2026-03-08 08:00 EDT is 23 hours, without 02:00 of the 8th
+        self.assertEqual(len(buckets), 24)
+        self.assertNotIn("2026-03-08T02:00:00-05:00", buckets)
+        self.assertNotIn("2026-03-08T02:00:00-04:00", buckets)
+        self.assertEqual(len(set(buckets)), len(buckets))
+
+    def test_day_buckets_keep_days_whose_midnight_is_skipped_by_dst(self):
+        # Santiago springs forward from 2026-09-06 00:00 to 01:00
+        response = self.get_series("tz=America/Santiago&bucket=day&timeframe=3", now=utc(2026, 9, 7, 12))
+
+        self.assertEqual(response.status_code, 200)
+        buckets = [item["bucket"][:10] for item in response.json()["series"]]
+        self.assertEqual(buckets, ["2026-09-04", "2026-09-05", "2026-09-06", "2026-09-07"])
+
+    def test_future_contents_do_not_extend_the_series(self):
+        self.create_content("future", utc(9999, 1, 1))
+
+        response = self.get_series("bucket=day&timeframe=2", now=utc(2026, 3, 10, 12))
+
+        self.assertEqual(len(response.json()["series"]), 3)
+
+    def test_zero_ids_filter_out_everything(self):
+        self.create_content("content", utc(2026, 3, 9, 15))
+
+        for query in ["author_id=0&title=content", "tag_id=0"]:
+            response = self.client.get(f"/api/contents/stats/?{query}")
+            self.assertEqual(response.json()["total_contents"], 0, query)
+
+    def test_rejects_unknown_timezones(self):
+        for tz in ["America", "posixrules", "Mars/Base", "../UTC"]:
+            response = self.client.get(f"/api/contents/stats/?tz={tz}&bucket=day")
+            self.assertEqual(response.status_code, 400, tz)
+
+    def test_rejects_series_over_the_bucket_limit(self):
+        response = self.client.get("/api/contents/stats/?bucket=hour&timeframe=365")
+
+        self.assertEqual(response.status_code, 400)
+
+
+class AuthorAggregateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        payloads = [
+            content_payload("content-1", likes=5, views=10),
+            content_payload("content-1", likes=8, views=12),
+            content_payload("content-2", likes=1, views=10),
+            content_payload("content-3", author_id="author-2", likes=4, views=10),
+        ]
+        for payload in payloads:
+            self.client.post("/api/contents/", payload, format="json")
+        self.author = Author.objects.get(unique_id="author-1")
+
+    def test_stats_deltas_add_up_to_the_author_counters(self):
+        self.assertEqual(
+            [getattr(self.author, field) for field in Author.AGGREGATE_FIELDS],
+            # content_count, total_likes, total_comments, total_views, total_shares
+            [2, 9, 2, 22, 0],
+        )
+
+    def test_failed_content_creation_leaves_no_trace(self):
+        with mock.patch.object(ContentStatsSnapshot, "record", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post("/api/contents/", content_payload("content-4", likes=3), format="json")
+
+        self.assertFalse(Content.objects.filter(unique_id="content-4").exists())
+        self.author.refresh_from_db()
+        self.assertEqual((self.author.content_count, self.author.total_likes), (2, 9))
+
+    def test_author_stats_are_a_single_row_read(self):
+        Author.objects.filter(id=self.author.id).update(followers=100)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/contents/stats/?author_id={self.author.id}")
+
+        data = response.json()
+        self.assertEqual(data["total_contents"], 2)
+        self.assertEqual(data["total_likes"], 9)
+        self.assertEqual(data["total_engagement"], 11)
+        self.assertEqual(data["total_followers"], 100)
+
+    def test_unknown_author_stats_are_empty(self):
+        response = self.client.get("/api/contents/stats/?author_id=0")
+
+        self.assertEqual(response.json()["total_contents"], 0)
+        self.assertEqual(response.json()["total_likes"], 0)
+
+    def test_sync_author_stats_detects_and_repairs_drift(self):
+        Author.objects.filter(id=self.author.id).update(total_likes=0, content_count=7)
+
+        output = StringIO()
+        call_command("sync_author_stats", stdout=output)
+        self.assertIn(f"Author {self.author.id}:", output.getvalue())
+        self.assertIn("1 author(s) with mismatched counters found", output.getvalue())
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.total_likes, 0)
+
+        call_command("sync_author_stats", "--repair", stdout=StringIO())
+        self.author.refresh_from_db()
+        self.assertEqual((self.author.content_count, self.author.total_likes), (2, 9))
 
-# Create your tests here.
+        output = StringIO()
+        call_command("sync_author_stats", stdout=output)
+        self.assertIn("0 author(s) with mismatched counters found", output.getvalue())
@@ -1,9 +1,81 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from contents.models import Content, Author, Tag, ContentTag
-from contents.serializers import ContentSerializer, ContentPostSerializer
+from contents.models import Content, Author, Tag, ContentTag, ContentStatsSnapshot
+from contents.serializers import (
+    ContentSerializer, ContentPostSerializer, ContentLookupSerializer, ContentStatsQuerySerializer,
+    ContentStatsHistorySerializer,
+)
+
+
+BUCKET_STEPS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+
+def floor_bucket(value, bucket):
+    """
+    Start of the `bucket` holding the naive local datetime `value`, same as postgres `date_trunc`
+    (weeks start on Monday).
+    """
+    value = value.replace(minute=0, second=0, microsecond=0)
+    if bucket == "hour":
+        return value
+    value = value.replace(hour=0)
+    if bucket == "week":
+        value -= timedelta(days=value.weekday())
+    return value
+
+
+def add_content_data(serialized_data, tags):
+    """
+    Add the additional data points of the `ContentAPIView` schema to a serialized `ContentSerializer` item.
+    - Total Engagement = like_count + comment_count + share_count
+    - Engagement Rate = Total Engagement / Views
+    - Tags: List of tags connected with the content
+    """
+    content = serialized_data["content"]
+    total_engagement = content["like_count"] + content["comment_count"] + content["share_count"]
+    if content["view_count"] > 0:
+        engagement_rate = total_engagement / content["view_count"]
+    else:
+        engagement_rate = 0
+    content["engagement_rate"] = engagement_rate
+    content["total_engagement"] = total_engagement
+    content["tags"] = tags
+
+
+def filter_contents(queryset, params, since=None):
+    """
+    Apply the client side filters shared by the content apis on a `Content` queryset.
+    `since` is the lower bound of the `timeframe` filter, the caller decides how it is aligned.
+    """
+    if "author_id" in params:
+        queryset = queryset.filter(author_id=params["author_id"])
+    if "author_username" in params:
+        queryset = queryset.filter(author__username=params["author_username"])
+    if since is not None:
+        queryset = queryset.filter(timestamp__gte=since)
+    if "tag_id" in params:
+        queryset = queryset.filter(
+            id__in=ContentTag.objects.filter(tag_id=params["tag_id"]).values("content_id")
+        )
+    if "tag" in params:
+        queryset = queryset.filter(
+            id__in=ContentTag.objects.filter(tag__name=params["tag"]).values("content_id")
+        )
+    if "title" in params:
+        queryset = queryset.filter(title__icontains=params["title"])
+    return queryset
 
 
 class ContentAPIView(APIView):
@@ -59,25 +131,12 @@ class ContentAPIView(APIView):
             data_list.append(data)
         serialized = ContentSerializer(data_list, many=True)
         for serialized_data in serialized.data:
-            # Calculating `Total Engagement`
-            # Calculating `Engagement Rate`
-            like_count = serialized_data.get("like_count", 0)
-            comment_count = serialized_data.get("comment_count", 0)
-            share_count = serialized_data.get("share_count", 0)
-            view_count = serialized_data.get("view_count", 0)
-            total_engagement = like_count + comment_count + share_count
-            if view_count > 0:
-                engagement_rate = total_engagement / view_count
-            else:
-                engagement_rate = 0
-            serialized_data["content"]["engagement_rate"] = engagement_rate
-            serialized_data["content"]["total_engagement"] = total_engagement
             tags = list(
                 ContentTag.objects.filter(
                     content_id=serialized_data["content"]["id"]
                 ).values_list("tag__name", flat=True)
             )
-            serialized_data["content"]["tags"] = tags
+            add_content_data(serialized_data, tags)
         return Response(serialized.data, status=status.HTTP_200_OK)
 
     def post(self, request, ):
@@ -124,24 +183,25 @@ class ContentAPIView(APIView):
                 unique_id=content["unq_external_id"]
             )
         except Content.DoesNotExist:
-
-            Content.objects.create(
-                unique_id=content["unq_external_id"],
-                author=author_object,
-                title=content.get("title"),
-                big_metadata=content.get("big_metadata"),
-                secret_value=content.get("secret_value"),
-                thumbnail_url=content.get("thumbnail_view_url"),
-                like_count=content["stats"]["likes"],
-                comment_count=content["stats"]["comments"],
-                share_count=content["stats"]["shares"],
-                view_count=content["stats"]["views"],
-            )
-
-            content_object = Content.objects.get(
-                unique_id=content["unq_external_id"]
-            )
+            # The content, its first snapshot and the author's aggregates are saved together or not at all
+            with transaction.atomic():
+                content_object = Content.objects.create(
+                    unique_id=content["unq_external_id"],
+                    author=author_object,
+                    title=content.get("title"),
+                    big_metadata=content.get("big_metadata"),
+                    secret_value=content.get("secret_value"),
+                    thumbnail_url=content.get("thumbnail_view_url"),
+                    like_count=content["stats"]["likes"],
+                    comment_count=content["stats"]["comments"],
+                    share_count=content["stats"]["shares"],
+                    view_count=content["stats"]["views"],
+                    timestamp=content.get("timestamp"),
+                )
+                content_object.record_stats()
             print("Content: ", content_object)
+        else:
+            content_object.update_stats(content["stats"])
 
         for tag in hashtags:
             try:
@@ -178,6 +238,43 @@ class ContentAPIView(APIView):
         )
 
 
+class ContentLookupAPIView(APIView):
+
+    def post(self, request):
+        """
+        Batch lookup of contents by their external unique id (`unq_external_id`), for reconciliation.
+        Returns the found contents in the `ContentAPIView` schema, in the requested order,
+        and the ids that were not found. Always two queries whatever the number of ids.
+        """
+        serializer = ContentLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        unique_ids = list(dict.fromkeys(serializer.validated_data["unq_external_ids"]))
+
+        contents = {
+            content.unique_id: content
+            for content in Content.objects.filter(unique_id__any=unique_ids).select_related("author")
+        }
+        tags = {}
+        for content_id, tag_name in ContentTag.objects.filter(
+            content_id__any=[content.id for content in contents.values()]
+        ).values_list("content_id", "tag__name"):
+            tags.setdefault(content_id, []).append(tag_name)
+
+        found = [contents[unique_id] for unique_id in unique_ids if unique_id in contents]
+        serialized = ContentSerializer(
+            [{"content": content, "author": content.author} for content in found],
+            many=True,
+        )
+        for serialized_data in serialized.data:
+            add_content_data(serialized_data, tags.get(serialized_data["content"]["id"], []))
+
+        data = {
+            "results": serialized.data,
+            "not_found": [unique_id for unique_id in unique_ids if unique_id not in contents],
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+
 class ContentStatsAPIView(APIView):
     """
     TODO: This api is taking way too much time to resolve.
@@ -201,34 +298,152 @@ class ContentStatsAPIView(APIView):
          - tag_id: Tag ID
          - title (insensitive match IE: SQL `ilike %text%`)
      --------------------------
-     Bonus: What changes do we need if we want timezone support?
+     Timezone support: `?tz=Area/City&bucket=hour|day|week` returns a dense time series of the same stats,
+     bucketed on the content's timestamp in the client's timezone. `timeframe` (30 days by default) then starts
+     at the beginning of the client's local bucket, so the first bucket is complete, and the series ends at now.
     """
     def get(self, request):
-        query_params = request.query_params.dict()
-        tag = query_params.get('tag', None)
-        data = {
-            "total_likes": 0,
-            "total_shares": 0,
-            "total_views": 0,
-            "total_comments": 0,
-            "total_engagement": 0,
-            "total_engagement_rate": 0,
-            "total_contents": 0,
-            "total_followers": 0,
-        }
-        if tag:
-            queryset = Content.objects.filter(
-                contentag__tag__name=tag
+        serializer = ContentStatsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        if params.get("bucket"):
+            return Response(self.get_series(params), status=status.HTTP_200_OK)
+
+        author_filters = params.keys() & {"author_id", "author_username"}
+        if author_filters and params.keys() - {"tz"} == author_filters:
+            # Author scoped stats are read from the aggregates maintained on the author
+            authors = Author.objects.all()
+            if "author_id" in params:
+                authors = authors.filter(id=params["author_id"])
+            if "author_username" in params:
+                authors = authors.filter(username=params["author_username"])
+            totals = authors.aggregate(
+                total_likes=Coalesce(Sum("total_likes"), 0),
+                total_shares=Coalesce(Sum("total_shares"), 0),
+                total_views=Coalesce(Sum("total_views"), 0),
+                total_comments=Coalesce(Sum("total_comments"), 0),
+                total_contents=Coalesce(Sum("content_count"), 0),
+                total_followers=Coalesce(Sum("followers"), 0),
             )
         else:
-            queryset = Content.objects.all()
-        for query in queryset:
-            data["total_likes"] += query.like_count
-            data["total_shares"] += query.share_count
-            data["total_comments"] += query.comment_count
-            data["total_views"] += query.view_count
-            data["total_engagement"] += data["total_likes"] + data["total_shares"] + data["total_comments"]
-            data["total_followers"] += query.author.followers
-            data["total_contents"] += 1
+            since = None
+            if params.get("timeframe"):
+                since = timezone.now() - timedelta(days=params["timeframe"])
+            queryset = filter_contents(Content.objects.all(), params, since)
+            totals = queryset.aggregate(
+                total_likes=Coalesce(Sum("like_count"), 0),
+                total_shares=Coalesce(Sum("share_count"), 0),
+                total_views=Coalesce(Sum("view_count"), 0),
+                total_comments=Coalesce(Sum("comment_count"), 0),
+                total_contents=Count("id"),
+            )
+            # Every author counted once, however many of their contents matched
+            totals.update(Author.objects.filter(
+                id__in=queryset.values("author_id"),
+            ).aggregate(total_followers=Coalesce(Sum("followers"), 0)))
 
+        total_engagement = totals["total_likes"] + totals["total_comments"] + totals["total_shares"]
+        data = {
+            "total_likes": totals["total_likes"],
+            "total_shares": totals["total_shares"],
+            "total_views": totals["total_views"],
+            "total_comments": totals["total_comments"],
+            "total_engagement": total_engagement,
+            "total_engagement_rate": total_engagement / totals["total_views"] if totals["total_views"] > 0 else 0,
+            "total_contents": totals["total_contents"],
+            "total_followers": totals["total_followers"],
+        }
         return Response(data, status=status.HTTP_201_CREATED)
+
+    def get_series(self, params):
+        """
+        One `GROUP BY date_trunc(bucket, timestamp AT TIME ZONE tz)` over the filtered contents,
+        the missing buckets are filled with zeros afterward.
+        """
+        zone, bucket = params["tz"], params["bucket"]
+        current_time = timezone.now()
+        now = floor_bucket(timezone.localtime(current_time, zone).replace(tzinfo=None), bucket)
+        first = floor_bucket(now - timedelta(days=params["timeframe"]), bucket)
+
+        queryset = filter_contents(
+            Content.objects.filter(timestamp__lte=current_time), params, timezone.make_aware(first, zone),
+        )
+        rows = queryset.annotate(
+            bucket=Trunc("timestamp", bucket, tzinfo=zone),
+        ).values("bucket").annotate(
+            total_likes=Sum("like_count"),
+            total_shares=Sum("share_count"),
+            total_views=Sum("view_count"),
+            total_comments=Sum("comment_count"),
+            total_engagement=Sum(F("like_count") + F("comment_count") + F("share_count")),
+            total_contents=Count("id"),
+        ).order_by("bucket")
+
+        # Buckets are keyed on the local wall clock, the way `date_trunc` sees them
+        buckets = {
+            timezone.localtime(row["bucket"], zone).replace(tzinfo=None): row for row in rows
+        }
+
+        series = []
+        current = first
+        while current <= now:
+            aware = timezone.make_aware(current, zone)
+            round_trip = timezone.localtime(aware.astimezone(dt_timezone.utc), zone).replace(tzinfo=None)
+            # Hours skipped by a DST change (IE: 02:00 on spring forward) have no bucket,
+            # days and weeks always exist even when their midnight is skipped
+            if bucket != "hour" or current in buckets or round_trip == current:
+                row = buckets.get(current, {})
+                total_engagement = row.get("total_engagement") or 0
+                total_views = row.get("total_views") or 0
+                series.append({
+                    "bucket": aware,
+                    "total_likes": row.get("total_likes") or 0,
+                    "total_shares": row.get("total_shares") or 0,
+                    "total_views": total_views,
+                    "total_comments": row.get("total_comments") or 0,
+                    "total_engagement": total_engagement,
+                    "total_engagement_rate": total_engagement / total_views if total_views > 0 else 0,
+                    "total_contents": row.get("total_contents") or 0,
+                })
+            current += BUCKET_STEPS[bucket]
+        return {"tz": str(zone), "bucket": bucket, "series": series}
+
+
+class ContentStatsHistoryAPIView(APIView):
+    """
+    Downsampled growth of a content (`content_id`) or of all the contents of an author (`author_id`)
+    between `start` and `end`, grouped in `bucket` (hour, day, week) sized buckets.
+    Each bucket holds the summed stats deltas of the snapshots captured in it.
+    """
+    def get(self, request):
+        serializer = ContentStatsHistorySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        queryset = ContentStatsSnapshot.objects.filter(
+            captured_at__gte=params["start"],
+            captured_at__lt=params["end"],
+        )
+        if "content_id" in params:
+            queryset = queryset.filter(content_id=params["content_id"])
+        else:
+            queryset = queryset.filter(author_id=params["author_id"])
+
+        series = queryset.annotate(
+            bucket=Trunc("captured_at", params["bucket"]),
+        ).values("bucket").annotate(
+            likes=Sum("like_delta"),
+            comments=Sum("comment_delta"),
+            views=Sum("view_delta"),
+            shares=Sum("share_delta"),
+        ).order_by("bucket")
+
+        data = {
+            "content_id": params.get("content_id"),
+            "author_id": params.get("author_id"),
+            "start": params["start"],
+            "end": params["end"],
+            "bucket": params["bucket"],
+            "series": list(series),
+        }
+        return Response(data, status=status.HTTP_200_OK)